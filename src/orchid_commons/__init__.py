@@ -76,6 +76,7 @@ from orchid_commons.db import (
 from orchid_commons.observability import (
     APIError,
     ErrorResponse,
+    FastAPIErrorMiddleware,
     LangfuseClient,
     LangfuseClientSettings,
     ObservabilityHandle,
@@ -108,6 +109,7 @@ from orchid_commons.observability.logging import (
     correlation_scope_from_headers,
     extract_correlation_ids,
     get_correlation_ids,
+    get_request_id,
     get_structlog_compat_logger,
     parse_traceparent,
 )
@@ -167,6 +169,7 @@ __all__ = [
     "ConfigValidationError",
     "CorrelationIds",
     "ErrorResponse",
+    "FastAPIErrorMiddleware",
     "HealthReport",
     "HealthStatus",
     "LangfuseClient",
@@ -246,6 +249,7 @@ __all__ = [
     "get_default_langfuse_client",
     "get_metrics_recorder",
     "get_observability_handle",
+    "get_request_id",
     "get_structlog_compat_logger",
     "http_request_scope",
     "load_config",
@@ -9,6 +9,7 @@ from orchid_commons.observability.http import (
 from orchid_commons.observability.http_errors import (
     APIError,
     ErrorResponse,
+    FastAPIErrorMiddleware,
     create_aiohttp_error_middleware,
     create_fastapi_error_middleware,
 )
@@ -37,6 +38,7 @@ from orchid_commons.observability.otel import (
 __all__ = [
     "APIError",
     "ErrorResponse",
+    "FastAPIErrorMiddleware",
     "LangfuseClient",
     "LangfuseClientSettings",
     "ObservabilityHandle",
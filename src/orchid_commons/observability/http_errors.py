@@ -2,21 +2,42 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
-import traceback
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import Awaitable, Callable, Mapping, MutableMapping, Sequence
 from dataclasses import dataclass, field
-from typing import Any, TypeAlias
+from typing import Any, TypeAlias, cast
 
-from orchid_commons.observability.logging import get_correlation_ids
+from orchid_commons.observability.logging import get_request_id
 from orchid_commons.runtime.errors import OrchidCommonsError
 
 logger = logging.getLogger(__name__)
 
-ExceptionHandler: TypeAlias = tuple[type[Exception], Callable[[Exception], "ErrorResponse"]]
-FastApiCallNext: TypeAlias = Callable[[Any], Awaitable[Any]]
+
+def _stdlib_json_dumps(content: Any) -> bytes:
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+_json_dumps: Callable[[Any], bytes]
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_dumps = _stdlib_json_dumps
+
+_JSON_CONTENT_TYPE_HEADER = (b"content-type", b"application/json")
+
+ExceptionHandlerFn: TypeAlias = Callable[[Exception], "ErrorResponse"]
+ExceptionHandler: TypeAlias = tuple[type[Exception], ExceptionHandlerFn]
+HandlerResolver: TypeAlias = Callable[[type[Exception]], ExceptionHandlerFn | None]
 AiohttpHandler: TypeAlias = Callable[[Any], Awaitable[Any]]
+JSONResponseFactory: TypeAlias = Callable[..., Any]
+ASGIScope: TypeAlias = MutableMapping[str, Any]
+ASGIReceive: TypeAlias = Callable[[], Awaitable[MutableMapping[str, Any]]]
+ASGISend: TypeAlias = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+ASGIApp: TypeAlias = Callable[[ASGIScope, ASGIReceive, ASGISend], Awaitable[None]]
 
 
 class APIError(OrchidCommonsError):
@@ -36,7 +57,7 @@ class APIError(OrchidCommonsError):
         super().__init__(message)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ErrorResponse:
     """Describes how to render an exception as an HTTP error."""
 
@@ -89,40 +110,43 @@ def _json_safe_value(value: Any, *, _seen: set[int] | None = None) -> Any:
 
 def _encode_json_body(content: dict[str, Any]) -> bytes:
     try:
-        return json.dumps(content).encode()
+        return _json_dumps(content)
     except (TypeError, ValueError):
-        fallback = _json_safe_value(content)
-        if isinstance(fallback, dict):
-            return json.dumps(fallback).encode()
-        return json.dumps(
-            {"error": {"code": "INTERNAL_ERROR", "message": "serialization failed"}}
-        ).encode()
+        pass
+    # The stdlib encoder also covers what orjson rejects (e.g. ints over 64 bits).
+    fallback = _json_safe_value(content)
+    if isinstance(fallback, dict):
+        try:
+            return _stdlib_json_dumps(fallback)
+        except (TypeError, ValueError):
+            pass
+    return _json_dumps({"error": {"code": "INTERNAL_ERROR", "message": "serialization failed"}})
 
 
-def _fastapi_json_response(*, content: dict[str, Any], status_code: int) -> Any:
+def _load_aiohttp_web() -> Any | None:
     try:
-        from starlette.responses import JSONResponse
+        from aiohttp import web as aiohttp_web
     except ModuleNotFoundError:
-        return _MinimalJSONResponse(content=content, status_code=status_code)
-    return JSONResponse(status_code=status_code, content=content)
+        return None
+    return aiohttp_web
 
 
-def _aiohttp_json_response(*, content: dict[str, Any], status_code: int) -> Any:
-    try:
-        from aiohttp import web as aiohttp_web
-    except ModuleNotFoundError:
-        return _MinimalJSONResponse(content=content, status_code=status_code)
-    return aiohttp_web.json_response(content, status=status_code)
+def _aiohttp_json_response_factory(aiohttp_web: Any | None) -> JSONResponseFactory:
+    """Bind the aiohttp response constructor once, at middleware build time."""
+    if aiohttp_web is None:
+        return _MinimalJSONResponse
 
+    response_cls = aiohttp_web.Response
 
-def _decorate_aiohttp_middleware(
-    middleware: Callable[[Any, AiohttpHandler], Awaitable[Any]],
-) -> Callable[[Any, AiohttpHandler], Awaitable[Any]]:
-    try:
-        from aiohttp import web as aiohttp_web
-    except ModuleNotFoundError:
-        return middleware
-    return aiohttp_web.middleware(middleware)  # type: ignore[return-value]
+    def json_response(*, content: dict[str, Any], status_code: int) -> Any:
+        return response_cls(
+            body=_encode_json_body(content),
+            status=status_code,
+            content_type="application/json",
+            charset="utf-8",
+        )
+
+    return json_response
 
 
 def _resolve_request_id(request: Any) -> str:
@@ -134,18 +158,27 @@ def _resolve_request_id(request: Any) -> str:
         if req_id is not None:
             return str(req_id)
 
-    # Try aiohttp dict-style
-    if isinstance(request, dict):
+    # Try aiohttp dict-style (web.Request is a MutableMapping, not a dict)
+    elif isinstance(request, dict) or isinstance(request, Mapping):
         req_id = request.get("request_id")
         if req_id is not None:
             return str(req_id)
 
     # Try correlation context
-    correlation = get_correlation_ids()
-    if correlation.request_id is not None:
-        return correlation.request_id
+    req_id = get_request_id()
+    return req_id if req_id is not None else "unknown"
+
+
+def _resolve_scope_request_id(scope: Mapping[str, Any]) -> str:
+    """Extract request ID from ASGI scope state, correlation context, or fallback."""
+    state = scope.get("state")
+    if isinstance(state, Mapping):
+        req_id = state.get("request_id")
+        if req_id is not None:
+            return str(req_id)
 
-    return "unknown"
+    req_id = get_request_id()
+    return req_id if req_id is not None else "unknown"
 
 
 def _build_error_body(
@@ -168,9 +201,30 @@ def _build_error_body(
     }
 
 
+def _compile_handlers(handlers: Sequence[ExceptionHandler]) -> HandlerResolver:
+    """Precompile handlers into a cached exception-type -> handler lookup.
+
+    The first registered handler whose type matches wins, exactly as with a
+    linear ``isinstance`` scan; the result is memoized per concrete type.
+    """
+    handled_types = tuple(handled_type for handled_type, _ in handlers)
+    handler_fns = tuple(handler for _, handler in handlers)
+
+    @functools.lru_cache(maxsize=256)
+    def resolve(exc_type: type[Exception]) -> ExceptionHandlerFn | None:
+        if not issubclass(exc_type, handled_types):
+            return None
+        for index, handled_type in enumerate(handled_types):
+            if issubclass(exc_type, handled_type):
+                return handler_fns[index]
+        return None  # pragma: no cover - guarded by the tuple check above
+
+    return cast(HandlerResolver, resolve)
+
+
 def _dispatch_exception(
     exc: Exception,
-    handlers: Sequence[ExceptionHandler],
+    resolve_handler: HandlerResolver,
     catch_all_message: str,
 ) -> ErrorResponse:
     """Match an exception to a handler and return an ErrorResponse."""
@@ -184,9 +238,9 @@ def _dispatch_exception(
             log_level=log_level,
         )
 
-    for exc_type, handler in handlers:
-        if isinstance(exc, exc_type):
-            return handler(exc)
+    handler = resolve_handler(type(exc))
+    if handler is not None:
+        return handler(exc)
 
     return ErrorResponse(
         code="INTERNAL_ERROR",
@@ -199,62 +253,96 @@ def _dispatch_exception(
 
 def _log_error(error_response: ErrorResponse, exc: Exception) -> None:
     """Log the error at the appropriate level."""
+    level = logging.WARNING if error_response.status_code < 500 else logging.ERROR
+    if error_response.log_level == logging.CRITICAL:
+        level = logging.ERROR
+    if not logger.isEnabledFor(level):
+        return
+
+    extra = {"error_code": error_response.code, "status_code": error_response.status_code}
     if error_response.log_level == logging.CRITICAL:
         # Catch-all: log with full traceback
+        logger.error("Unexpected error: %s", exc, exc_info=exc, extra=extra)
+    elif level == logging.ERROR:
         logger.error(
-            "Unexpected error: %s",
-            exc,
-            exc_info=True,
-            extra={
-                "error_code": error_response.code,
-                "status_code": error_response.status_code,
-                "traceback": traceback.format_exception(type(exc), exc, exc.__traceback__),
-            },
-        )
-    elif error_response.status_code >= 500:
-        logger.error(
-            "Server error: %s — %s",
-            error_response.code,
-            error_response.message,
-            extra={
-                "error_code": error_response.code,
-                "status_code": error_response.status_code,
-            },
+            "Server error: %s — %s", error_response.code, error_response.message, extra=extra
         )
     else:
         logger.warning(
-            "Client error: %s — %s",
-            error_response.code,
-            error_response.message,
-            extra={
-                "error_code": error_response.code,
-                "status_code": error_response.status_code,
-            },
+            "Client error: %s — %s", error_response.code, error_response.message, extra=extra
         )
 
 
-def create_fastapi_error_middleware(
-    handlers: Sequence[ExceptionHandler] = (),
-    catch_all_message: str = "An unexpected error occurred",
-) -> Callable[[Any, FastApiCallNext], Awaitable[Any]]:
-    """Build FastAPI middleware that catches exceptions and returns JSON error responses."""
+def _asgi_response_start(status_code: int, content_length: int) -> dict[str, Any]:
+    # Downstream ``send`` wrappers (CORS, GZip, ...) mutate the headers list in
+    # place, so only the immutable header tuples are shared between responses.
+    return {
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [_JSON_CONTENT_TYPE_HEADER, (b"content-length", b"%d" % content_length)],
+    }
+
+
+class FastAPIErrorMiddleware:
+    """Pure ASGI middleware that catches exceptions and returns JSON error responses.
+
+    Unlike ``BaseHTTPMiddleware`` it does not buffer responses through a memory
+    stream; the success path is a direct call into the wrapped application.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        handlers: Sequence[ExceptionHandler] = (),
+        catch_all_message: str = "An unexpected error occurred",
+    ) -> None:
+        self.app = app
+        self.handlers = tuple(handlers)
+        self._resolve_handler = _compile_handlers(self.handlers)
+        self.catch_all_message = catch_all_message
+
+    async def __call__(self, scope: ASGIScope, receive: ASGIReceive, send: ASGISend) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: MutableMapping[str, Any]) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-    async def middleware(request: Any, call_next: FastApiCallNext) -> Any:
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            error_response = _dispatch_exception(exc, handlers, catch_all_message)
+            if response_started:
+                # Headers are already on the wire; nothing sane left to send.
+                raise
+            error_response = _dispatch_exception(exc, self._resolve_handler, self.catch_all_message)
             _log_error(error_response, exc)
-            request_id = _resolve_request_id(request)
             body = _build_error_body(
-                request_id,
+                _resolve_scope_request_id(scope),
                 error_response.code,
                 error_response.message,
                 error_response.details,
             )
-            return _fastapi_json_response(content=body, status_code=error_response.status_code)
+            payload = _encode_json_body(body)
+            await send(_asgi_response_start(error_response.status_code, len(payload)))
+            await send({"type": "http.response.body", "body": payload})
 
-    return middleware
+
+def create_fastapi_error_middleware(
+    handlers: Sequence[ExceptionHandler] = (),
+    catch_all_message: str = "An unexpected error occurred",
+) -> Callable[[ASGIApp], FastAPIErrorMiddleware]:
+    """Build an ASGI middleware factory for ``app.add_middleware(...)``."""
+
+    def factory(app: ASGIApp) -> FastAPIErrorMiddleware:
+        return FastAPIErrorMiddleware(app, handlers=handlers, catch_all_message=catch_all_message)
+
+    return factory
 
 
 def create_aiohttp_error_middleware(
@@ -263,12 +351,15 @@ def create_aiohttp_error_middleware(
     decorate: bool = True,
 ) -> Callable[[Any, AiohttpHandler], Awaitable[Any]]:
     """Build aiohttp middleware that catches exceptions and returns JSON error responses."""
+    resolve_handler = _compile_handlers(handlers)
+    aiohttp_web = _load_aiohttp_web()
+    json_response = _aiohttp_json_response_factory(aiohttp_web)
 
     async def middleware(request: Any, handler: AiohttpHandler) -> Any:
         try:
             return await handler(request)
         except Exception as exc:
-            error_response = _dispatch_exception(exc, handlers, catch_all_message)
+            error_response = _dispatch_exception(exc, resolve_handler, catch_all_message)
             _log_error(error_response, exc)
             request_id = _resolve_request_id(request)
             body = _build_error_body(
@@ -277,10 +368,10 @@ def create_aiohttp_error_middleware(
                 error_response.message,
                 error_response.details,
             )
-            return _aiohttp_json_response(content=body, status_code=error_response.status_code)
+            return json_response(content=body, status_code=error_response.status_code)
 
-    if decorate:
-        return _decorate_aiohttp_middleware(middleware)
+    if decorate and aiohttp_web is not None:
+        return aiohttp_web.middleware(middleware)
     return middleware
 
 
@@ -288,6 +379,7 @@ __all__ = [
     "APIError",
     "ErrorResponse",
     "ExceptionHandler",
+    "FastAPIErrorMiddleware",
     "create_aiohttp_error_middleware",
     "create_fastapi_error_middleware",
 ]
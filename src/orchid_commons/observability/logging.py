@@ -179,6 +179,11 @@ def get_correlation_ids() -> CorrelationIds:
     )
 
 
+def get_request_id() -> str | None:
+    """Read only the bound request ID, skipping the OpenTelemetry span lookup."""
+    return _REQUEST_ID_CTX.get()
+
+
 @contextmanager
 def correlation_scope(
     *,
@@ -64,6 +64,8 @@ def __getattr__(name: str) -> Any:
             "bootstrap_resources": bootstrap_resources,
             "register_factory": register_factory,
         }
+        # Cache in module globals so later lookups bypass __getattr__.
+        globals().update(exported)
         return exported[name]
 
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,51 +3,61 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
+from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 
-from orchid_commons.db import create_rabbitmq_broker
-
-pytestmark = pytest.mark.integration
-
-
-async def _wait_for_queue_message(
-    queue: Any,
-    *,
-    timeout_seconds: float = 15.0,
-    poll_timeout_seconds: float = 1.0,
-) -> Any:
-    deadline = asyncio.get_running_loop().time() + timeout_seconds
-    while asyncio.get_running_loop().time() < deadline:
-        try:
-            message = await queue.get(timeout=poll_timeout_seconds)
-        except TimeoutError:
-            continue
-        except Exception as exc:
-            if exc.__class__.__name__ == "QueueEmpty":
-                continue
-            raise
-        if message is not None:
-            return message
-    raise AssertionError(f"No message received from queue within {timeout_seconds:.1f}s")
-
-
-async def test_rabbitmq_publish_and_health(rabbitmq_settings) -> None:
+from orchid_commons.db import RabbitMqBroker, create_rabbitmq_broker
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio(loop_scope="module")]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def rabbitmq_broker(rabbitmq_settings) -> AsyncIterator[RabbitMqBroker]:
+    # Opening an AMQP connection and channel per test dominated the module's
+    # runtime; one broker is reused and closed after the last test.
     broker = await create_rabbitmq_broker(rabbitmq_settings)
     try:
-        queue = await broker.declare_queue("integration_test_queue", durable=False)
+        yield broker
+    finally:
+        await broker.close()
+
+
+async def _consume_one_message(queue: Any, *, timeout_seconds: float = 15.0) -> Any:
+    received: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+
+    async def on_message(message: Any) -> None:
+        if not received.done():
+            received.set_result(message)
+
+    consumer_tag = await queue.consume(on_message)
+    try:
+        return await asyncio.wait_for(received, timeout_seconds)
+    except TimeoutError as exc:
+        raise AssertionError(
+            f"No message received from queue within {timeout_seconds:.1f}s"
+        ) from exc
+    finally:
+        await queue.cancel(consumer_tag)
 
-        await broker.publish(
+
+async def test_rabbitmq_publish_and_health(rabbitmq_broker: RabbitMqBroker) -> None:
+    queue_name = f"integration_test_queue_{uuid4().hex[:8]}"
+    queue = await rabbitmq_broker.declare_queue(queue_name, durable=False)
+    try:
+        await rabbitmq_broker.publish(
             {"event": "test", "data": "hello"},
-            queue_name="integration_test_queue",
+            queue_name=queue_name,
         )
 
         # Consume one message to verify it arrived, tolerating startup jitter.
-        message = await _wait_for_queue_message(queue)
+        message = await _consume_one_message(queue)
         assert message is not None
         await message.ack()
 
-        assert (await broker.health_check()).healthy is True
+        assert (await rabbitmq_broker.health_check()).healthy is True
     finally:
-        await broker.close()
+        await queue.delete(if_unused=False, if_empty=False)
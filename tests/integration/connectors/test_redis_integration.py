@@ -3,57 +3,57 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
+from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 
-from orchid_commons.db import create_redis_cache
+from orchid_commons.db import RedisCache, create_redis_cache
 
-pytestmark = pytest.mark.integration
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio(loop_scope="module")]
 
 
-async def _wait_until_key_absent(
-    cache: object,
-    key: str,
-    *,
-    timeout_seconds: float = 5.0,
-    poll_interval_seconds: float = 0.1,
-) -> None:
-    deadline = asyncio.get_running_loop().time() + timeout_seconds
-    while asyncio.get_running_loop().time() < deadline:
-        if await cache.get(key) is None:
-            return
-        await asyncio.sleep(poll_interval_seconds)
-    raise AssertionError(f"Key '{key}' did not expire within {timeout_seconds:.1f}s")
-
-
-async def test_redis_roundtrip(redis_settings) -> None:
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def redis_cache(redis_settings) -> AsyncIterator[RedisCache]:
+    # The client's connection pool is bound to the loop that created it, so the
+    # fixture and every test in this module share the module-scoped loop.
     cache = await create_redis_cache(redis_settings)
     try:
-        await cache.set("test_key", "hello")
-        value = await cache.get("test_key")
-        assert value == "hello"
+        yield cache
+    finally:
+        await cache.close()
 
-        exists = await cache.exists("test_key")
-        assert exists is True
 
-        deleted = await cache.delete("test_key")
-        assert deleted == 1
+async def _assert_expires(cache: RedisCache, key: str, *, ttl_seconds: float) -> None:
+    # Redis expires keys lazily on access, so one GET once the TTL has elapsed
+    # is deterministic; no polling needed.
+    await asyncio.sleep(ttl_seconds + 0.1)
+    assert await cache.get(key) is None, f"Key '{key}' did not expire after {ttl_seconds:.1f}s"
 
-        exists_after = await cache.exists("test_key")
-        assert exists_after is False
 
-        assert (await cache.health_check()).healthy is True
-    finally:
-        await cache.close()
+async def test_redis_roundtrip(redis_cache: RedisCache) -> None:
+    key = f"{uuid4().hex}:test_key"
+    await redis_cache.set(key, "hello")
+    value = await redis_cache.get(key)
+    assert value == "hello"
 
+    exists = await redis_cache.exists(key)
+    assert exists is True
 
-async def test_redis_ttl(redis_settings) -> None:
-    cache = await create_redis_cache(redis_settings)
-    try:
-        await cache.set("ttl_key", "expires", ttl_seconds=1)
-        value = await cache.get("ttl_key")
-        assert value == "expires"
+    deleted = await redis_cache.delete(key)
+    assert deleted == 1
 
-        await _wait_until_key_absent(cache, "ttl_key", timeout_seconds=5.0)
-    finally:
-        await cache.close()
+    exists_after = await redis_cache.exists(key)
+    assert exists_after is False
+
+    assert (await redis_cache.health_check()).healthy is True
+
+
+async def test_redis_ttl(redis_cache: RedisCache) -> None:
+    key = f"{uuid4().hex}:ttl_key"
+    await redis_cache.set(key, "expires", ttl_seconds=1)
+    value = await redis_cache.get(key)
+    assert value == "expires"
+
+    await _assert_expires(redis_cache, key, ttl_seconds=1)
@@ -4,19 +4,28 @@ from __future__ import annotations
 
 import json
 import logging
+import sys
+import weakref
+from collections import UserDict
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
+from orchid_commons.observability import http_errors
 from orchid_commons.observability.http_errors import (
     APIError,
     ErrorResponse,
+    FastAPIErrorMiddleware,
     _build_error_body,
+    _compile_handlers,
     _dispatch_exception,
+    _encode_json_body,
     _log_error,
     _MinimalJSONResponse,
     _resolve_request_id,
+    _stdlib_json_dumps,
+    create_aiohttp_error_middleware,
     create_fastapi_error_middleware,
 )
 from orchid_commons.observability.logging import correlation_scope
@@ -42,12 +51,6 @@ class FakeFastApiRequest:
         self.state = SimpleNamespace()
 
 
-class FakeFastApiResponse:
-    def __init__(self, status_code: int) -> None:
-        self.status_code = status_code
-        self.headers: dict[str, str] = {}
-
-
 # ---------------------------------------------------------------------------
 # APIError hierarchy
 # ---------------------------------------------------------------------------
@@ -76,6 +79,31 @@ class TestAPIError:
         err = APIError(code="X", message="hello")
         assert str(err) == "hello"
 
+    def test_supports_weak_references(self) -> None:
+        err = APIError(code="C", message="m")
+        assert weakref.ref(err)() is err
+        base = OrchidCommonsError("x")
+        assert weakref.ref(base)() is base
+
+    @pytest.mark.parametrize("mixin", [OSError, TimeoutError, ConnectionError])
+    def test_can_mix_in_builtin_exceptions(self, mixin: type[Exception]) -> None:
+        class UpstreamError(APIError, mixin):  # type: ignore[misc, valid-type]
+            pass
+
+        err = UpstreamError(code="UPSTREAM", message="down", status_code=502)
+        assert isinstance(err, mixin)
+        assert err.status_code == 502
+
+    def test_subclasses_can_add_attributes(self) -> None:
+        class NotFoundError(APIError):
+            def __init__(self, resource: str) -> None:
+                self.resource = resource
+                super().__init__(code="NOT_FOUND", message=f"{resource} not found", status_code=404)
+
+        err = NotFoundError("user")
+        assert err.resource == "user"
+        assert err.status_code == 404
+
 
 # ---------------------------------------------------------------------------
 # ErrorResponse dataclass
@@ -88,6 +116,10 @@ class TestErrorResponse:
         with pytest.raises(AttributeError):
             resp.code = "Y"  # type: ignore[misc]
 
+    def test_slotted(self) -> None:
+        resp = ErrorResponse(code="X", message="x")
+        assert not hasattr(resp, "__dict__")
+
     def test_defaults(self) -> None:
         resp = ErrorResponse(code="X", message="x")
         assert resp.status_code == 400
@@ -120,6 +152,32 @@ class TestResolveRequestId:
         req: dict[str, Any] = {"request_id": "dict-id"}
         assert _resolve_request_id(req) == "dict-id"
 
+    def test_from_mapping_style_request(self) -> None:
+        class FakeAiohttpRequest(UserDict[str, Any]):
+            pass
+
+        assert _resolve_request_id(FakeAiohttpRequest(request_id="aio-id")) == "aio-id"
+
+    def test_state_is_read_per_instance(self) -> None:
+        class PlainRequest:
+            pass
+
+        assert _resolve_request_id(PlainRequest()) == "unknown"
+        second = PlainRequest()
+        second.state = SimpleNamespace(request_id="r2")  # type: ignore[attr-defined]
+        assert _resolve_request_id(second) == "r2"
+
+    def test_starlette_request_reads_state_not_scope(self) -> None:
+        starlette_requests = pytest.importorskip("starlette.requests")
+        request = starlette_requests.Request({"type": "http", "request_id": "scope-key"})
+        assert _resolve_request_id(request) == "unknown"
+        request.state.request_id = "state-id"
+        assert _resolve_request_id(request) == "state-id"
+
+    def test_unsupported_request_type_uses_correlation_context(self) -> None:
+        with correlation_scope(request_id="corr-obj"):
+            assert _resolve_request_id(object()) == "corr-obj"
+
 
 # ---------------------------------------------------------------------------
 # _build_error_body
@@ -158,6 +216,42 @@ class TestMinimalJsonResponse:
         assert "raw" in decoded
         assert "items" in decoded
 
+    def test_body_is_compact_json_bytes(self) -> None:
+        response = _MinimalJSONResponse(content={"error": {"code": "X", "n": 1}}, status_code=400)
+
+        assert isinstance(response.body, bytes)
+        assert response.body == b'{"error":{"code":"X","n":1}}'
+
+    def test_stdlib_encoder_matches_default_encoder(self) -> None:
+        content = {"error": {"code": "X", "details": {"ids": [1, 2]}, "ok": True}}
+        assert _stdlib_json_dumps(content) == _encode_json_body(content)
+
+    def test_oversized_int_details_keep_error_payload(self) -> None:
+        response = _MinimalJSONResponse(
+            content={"error": {"code": "X", "message": "m", "details": {"big": 2**70}}},
+            status_code=400,
+        )
+
+        assert json.loads(response.body) == {
+            "error": {"code": "X", "message": "m", "details": {"big": 2**70}}
+        }
+
+    def test_falls_back_to_stdlib_when_primary_encoder_rejects(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def reject(_: Any) -> bytes:
+            raise TypeError("Integer exceeds 64-bit range")
+
+        monkeypatch.setattr(http_errors, "_json_dumps", reject)
+        content = {"error": {"code": "X", "message": "m", "details": {"big": 2**70}}}
+
+        assert _encode_json_body(content) == _stdlib_json_dumps(content)
+
+    def test_non_string_keys_are_coerced(self) -> None:
+        response = _MinimalJSONResponse(content={"error": {1: "one"}}, status_code=400)
+
+        assert json.loads(response.body) == {"error": {"1": "one"}}
+
 
 # ---------------------------------------------------------------------------
 # _dispatch_exception
@@ -183,20 +277,26 @@ def _handle_specific_error(exc: Exception) -> ErrorResponse:
 class TestDispatchException:
     def test_api_error_builtin(self) -> None:
         exc = APIError(code="AUTH", message="unauthorized", status_code=401)
-        resp = _dispatch_exception(exc, [], "catch-all")
+        resp = _dispatch_exception(exc, _compile_handlers([]), "catch-all")
         assert resp.code == "AUTH"
         assert resp.status_code == 401
         assert resp.log_level == logging.WARNING
 
+    def test_api_error_details_are_shared_not_copied(self) -> None:
+        details = {"field": "name"}
+        exc = APIError(code="BAD", message="bad", details=details)
+        resp = _dispatch_exception(exc, _compile_handlers([]), "catch-all")
+        assert resp.details is details
+
     def test_api_error_5xx_uses_error_level(self) -> None:
         exc = APIError(code="FAIL", message="fail", status_code=503)
-        resp = _dispatch_exception(exc, [], "catch-all")
+        resp = _dispatch_exception(exc, _compile_handlers([]), "catch-all")
         assert resp.log_level == logging.ERROR
 
     def test_handler_matches_isinstance(self) -> None:
         exc = MyAppError("oops")
         handlers = [(MyAppError, _handle_app_error)]
-        resp = _dispatch_exception(exc, handlers, "catch-all")
+        resp = _dispatch_exception(exc, _compile_handlers(handlers), "catch-all")
         assert resp.code == "APP_ERROR"
         assert resp.status_code == 422
 
@@ -207,7 +307,7 @@ class TestDispatchException:
             (MySpecificError, _handle_specific_error),
             (MyAppError, _handle_app_error),
         ]
-        resp = _dispatch_exception(exc, handlers, "catch-all")
+        resp = _dispatch_exception(exc, _compile_handlers(handlers), "catch-all")
         assert resp.code == "SPECIFIC"
         assert resp.status_code == 409
 
@@ -218,12 +318,23 @@ class TestDispatchException:
             (MyAppError, _handle_app_error),
             (MySpecificError, _handle_specific_error),
         ]
-        resp = _dispatch_exception(exc, handlers, "catch-all")
+        resp = _dispatch_exception(exc, _compile_handlers(handlers), "catch-all")
         assert resp.code == "APP_ERROR"
 
+    def test_resolution_is_cached_per_exception_type(self) -> None:
+        resolve = _compile_handlers([(MyAppError, _handle_app_error)])
+        for _ in range(3):
+            assert resolve(MySpecificError) is _handle_app_error
+        assert resolve.cache_info().misses == 1  # type: ignore[attr-defined]
+        assert resolve.cache_info().hits == 2  # type: ignore[attr-defined]
+
+    def test_unmatched_type_resolves_to_none(self) -> None:
+        resolve = _compile_handlers([(MyAppError, _handle_app_error)])
+        assert resolve(KeyError) is None
+
     def test_catch_all_no_leak(self) -> None:
         exc = RuntimeError("internal secret")
-        resp = _dispatch_exception(exc, [], "Something went wrong")
+        resp = _dispatch_exception(exc, _compile_handlers([]), "Something went wrong")
         assert resp.code == "INTERNAL_ERROR"
         assert resp.message == "Something went wrong"
         assert "internal secret" not in resp.message
@@ -231,7 +342,7 @@ class TestDispatchException:
 
     def test_catch_all_uses_critical_log_level(self) -> None:
         exc = RuntimeError("boom")
-        resp = _dispatch_exception(exc, [], "oops")
+        resp = _dispatch_exception(exc, _compile_handlers([]), "oops")
         assert resp.log_level == logging.CRITICAL
 
 
@@ -253,6 +364,14 @@ class TestLogError:
             _log_error(resp, RuntimeError("fail"))
         assert any("Server error" in r.message for r in caplog.records)
 
+    def test_structured_extra_fields(self, caplog: pytest.LogCaptureFixture) -> None:
+        resp = ErrorResponse(code="BAD", message="bad", status_code=409)
+        with caplog.at_level(logging.WARNING, logger="orchid_commons.observability.http_errors"):
+            _log_error(resp, ValueError("bad"))
+        record = caplog.records[-1]
+        assert record.error_code == "BAD"  # type: ignore[attr-defined]
+        assert record.status_code == 409  # type: ignore[attr-defined]
+
     def test_traceback_for_catch_all(self, caplog: pytest.LogCaptureFixture) -> None:
         resp = ErrorResponse(
             code="INTERNAL_ERROR", message="oops", status_code=500, log_level=logging.CRITICAL
@@ -265,6 +384,24 @@ class TestLogError:
         records = [r for r in caplog.records if "Unexpected error" in r.message]
         assert len(records) == 1
         assert records[0].exc_info is not None
+        assert "RuntimeError: boom" in caplog.text
+        assert not hasattr(records[0], "traceback")
+
+    def test_skips_work_when_level_disabled(
+        self, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*_: Any, **__: Any) -> None:
+            raise AssertionError("log call made while the level is disabled")
+
+        monkeypatch.setattr(http_errors.logger, "error", fail)
+        monkeypatch.setattr(http_errors.logger, "warning", fail)
+        resp = ErrorResponse(
+            code="INTERNAL_ERROR", message="oops", status_code=500, log_level=logging.CRITICAL
+        )
+        with caplog.at_level(logging.CRITICAL, logger="orchid_commons.observability.http_errors"):
+            _log_error(resp, RuntimeError("boom"))
+            _log_error(ErrorResponse(code="BAD", message="bad"), ValueError("bad"))
+        assert caplog.records == []
 
 
 # ---------------------------------------------------------------------------
@@ -272,33 +409,76 @@ class TestLogError:
 # ---------------------------------------------------------------------------
 
 
+class _RecordingSend:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+    async def __call__(self, message: dict[str, Any]) -> None:
+        self.messages.append(message)
+
+    @property
+    def status(self) -> int:
+        return self.messages[0]["status"]
+
+    @property
+    def body(self) -> str:
+        return b"".join(m.get("body", b"") for m in self.messages[1:]).decode()
+
+
+async def _receive() -> dict[str, Any]:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def _http_scope(request_id: str | None = None) -> dict[str, Any]:
+    state: dict[str, Any] = {}
+    if request_id is not None:
+        state["request_id"] = request_id
+    return {"type": "http", "method": "GET", "path": "/health", "state": state}
+
+
+def _raising_app(exc: Exception) -> Any:
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        raise exc
+
+    return app
+
+
 class TestFastApiErrorMiddleware:
     async def test_passthrough_success(self) -> None:
-        middleware = create_fastapi_error_middleware()
-        req = FakeFastApiRequest()
-        req.state.request_id = "req-ok"
+        async def app(scope: Any, receive: Any, send: Any) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            return FakeFastApiResponse(status_code=200)
+        middleware = create_fastapi_error_middleware()(app)
+        send = _RecordingSend()
+        await middleware(_http_scope("req-ok"), _receive, send)
+        assert send.status == 200
+        assert send.body == "ok"
 
-        resp = await middleware(req, call_next)
-        assert resp.status_code == 200
+    async def test_non_http_scope_is_passed_through(self) -> None:
+        seen: list[str] = []
 
-    async def test_handles_api_error(self) -> None:
-        middleware = create_fastapi_error_middleware()
-        req = FakeFastApiRequest()
-        req.state.request_id = "req-api"
+        async def app(scope: Any, receive: Any, send: Any) -> None:
+            seen.append(scope["type"])
+            raise RuntimeError("lifespan failure")
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            raise APIError(
-                code="BAD_INPUT", message="invalid", status_code=422, details={"field": "x"}
-            )
+        middleware = create_fastapi_error_middleware()(app)
+        with pytest.raises(RuntimeError):
+            await middleware({"type": "lifespan"}, _receive, _RecordingSend())
+        assert seen == ["lifespan"]
 
-        resp = await middleware(req, call_next)
-        assert resp.status_code == 422
-        body = resp.body.decode()
-        assert "BAD_INPUT" in body
-        assert "req-api" in body
+    async def test_handles_api_error(self) -> None:
+        exc = APIError(code="BAD_INPUT", message="invalid", status_code=422, details={"field": "x"})
+        middleware = create_fastapi_error_middleware()(_raising_app(exc))
+        send = _RecordingSend()
+        await middleware(_http_scope("req-api"), _receive, send)
+        assert send.status == 422
+        headers = dict(send.messages[0]["headers"])
+        assert headers[b"content-type"] == b"application/json"
+        assert headers[b"content-length"] == str(len(send.body.encode())).encode()
+        payload = json.loads(send.body)
+        assert payload["error"]["code"] == "BAD_INPUT"
+        assert payload["error"]["request_id"] == "req-api"
 
     async def test_handles_registered_exception(self) -> None:
         def handle_value_error(exc: Exception) -> ErrorResponse:
@@ -306,54 +486,111 @@ class TestFastApiErrorMiddleware:
 
         middleware = create_fastapi_error_middleware(
             handlers=[(ValueError, handle_value_error)],
+        )(_raising_app(ValueError("bad value")))
+        send = _RecordingSend()
+        await middleware(_http_scope("req-val"), _receive, send)
+        assert send.status == 400
+        assert "VAL_ERR" in send.body
+
+    async def test_catch_all_returns_500(self) -> None:
+        middleware = create_fastapi_error_middleware(catch_all_message="Something broke")(
+            _raising_app(RuntimeError("secret internal error"))
         )
-        req = FakeFastApiRequest()
-        req.state.request_id = "req-val"
+        send = _RecordingSend()
+        await middleware(_http_scope("req-500"), _receive, send)
+        assert send.status == 500
+        assert "INTERNAL_ERROR" in send.body
+        assert "Something broke" in send.body
+        assert "secret internal error" not in send.body
+
+    async def test_start_messages_do_not_share_header_lists(self) -> None:
+        middleware = create_fastapi_error_middleware()(
+            _raising_app(APIError(code="X", message="x"))
+        )
+        first, second = _RecordingSend(), _RecordingSend()
+        await middleware(_http_scope(), _receive, first)
+        first.messages[0]["headers"].append((b"x-extra", b"1"))
+        await middleware(_http_scope(), _receive, second)
+        assert (b"x-extra", b"1") not in second.messages[0]["headers"]
+
+    async def test_reraises_when_response_already_started(self) -> None:
+        async def app(scope: Any, receive: Any, send: Any) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            raise RuntimeError("mid-stream")
+
+        middleware = create_fastapi_error_middleware()(app)
+        send = _RecordingSend()
+        with pytest.raises(RuntimeError):
+            await middleware(_http_scope(), _receive, send)
+        assert len(send.messages) == 1
+
+    async def test_request_id_from_correlation_context(self) -> None:
+        middleware = create_fastapi_error_middleware()(
+            _raising_app(APIError(code="X", message="x"))
+        )
+        send = _RecordingSend()
+        with correlation_scope(request_id="corr-123"):
+            await middleware(_http_scope(), _receive, send)
+        assert "corr-123" in send.body
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            raise ValueError("bad value")
+    async def test_request_id_unknown_fallback(self) -> None:
+        middleware = create_fastapi_error_middleware()(
+            _raising_app(APIError(code="X", message="x"))
+        )
+        send = _RecordingSend()
+        await middleware(_http_scope(), _receive, send)
+        assert "unknown" in send.body
 
-        resp = await middleware(req, call_next)
-        assert resp.status_code == 400
-        body = resp.body.decode()
-        assert "VAL_ERR" in body
+    def test_factory_builds_middleware_instance(self) -> None:
+        async def app(scope: Any, receive: Any, send: Any) -> None:
+            return None
 
-    async def test_catch_all_returns_500(self) -> None:
-        middleware = create_fastapi_error_middleware(catch_all_message="Something broke")
-        req = FakeFastApiRequest()
-        req.state.request_id = "req-500"
+        middleware = create_fastapi_error_middleware(catch_all_message="oops")(app)
+        assert isinstance(middleware, FastAPIErrorMiddleware)
+        assert middleware.app is app
+        assert middleware.catch_all_message == "oops"
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            raise RuntimeError("secret internal error")
 
-        resp = await middleware(req, call_next)
-        assert resp.status_code == 500
-        body = resp.body.decode()
-        assert "INTERNAL_ERROR" in body
-        assert "Something broke" in body
-        assert "secret internal error" not in body
+# ---------------------------------------------------------------------------
+# aiohttp middleware integration
+# ---------------------------------------------------------------------------
 
-    async def test_request_id_from_correlation_context(self) -> None:
-        middleware = create_fastapi_error_middleware()
-        req = FakeFastApiRequest()
-        # No request_id on state
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            raise APIError(code="X", message="x")
+class TestAiohttpErrorMiddleware:
+    async def test_handles_api_error(self) -> None:
+        middleware = create_aiohttp_error_middleware(decorate=False)
+        request: dict[str, Any] = {"request_id": "req-aio"}
 
-        with correlation_scope(request_id="corr-123"):
-            resp = await middleware(req, call_next)
+        async def handler(_: Any) -> Any:
+            raise APIError(code="NOPE", message="missing", status_code=404)
 
-        body = resp.body.decode()
-        assert "corr-123" in body
+        resp = await middleware(request, handler)
+        assert resp.status == 404
+        assert resp.content_type == "application/json"
+        assert resp.charset == "utf-8"
+        payload = json.loads(resp.body)
+        assert payload["error"]["code"] == "NOPE"
+        assert payload["error"]["request_id"] == "req-aio"
 
-    async def test_request_id_unknown_fallback(self) -> None:
-        middleware = create_fastapi_error_middleware()
-        req = FakeFastApiRequest()
+    async def test_response_body_uses_shared_encoder(self) -> None:
+        middleware = create_aiohttp_error_middleware(decorate=False)
 
-        async def call_next(_: Any) -> FakeFastApiResponse:
-            raise APIError(code="X", message="x")
+        async def handler(_: Any) -> Any:
+            raise APIError(code="X", message="x", details={"n": 1})
+
+        resp = await middleware({"request_id": "r"}, handler)
+        expected = _build_error_body("r", "X", "x", {"n": 1})
+        assert resp.body == _encode_json_body(expected)
+
+    async def test_falls_back_to_minimal_response_without_aiohttp(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "aiohttp", None)
+        middleware = create_aiohttp_error_middleware()
+
+        async def handler(_: Any) -> Any:
+            raise RuntimeError("boom")
 
-        resp = await middleware(req, call_next)
-        body = resp.body.decode()
-        assert "unknown" in body
+        resp = await middleware({}, handler)
+        assert isinstance(resp, _MinimalJSONResponse)
+        assert resp.status == 500
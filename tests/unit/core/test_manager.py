@@ -287,3 +287,23 @@ class TestResourceManager:
             reset_resource_factories()
             manager_module._RESOURCE_FACTORIES.update(original_factories)
             manager_module._BUILTIN_FACTORIES_REGISTERED = original_registered
+
+
+class TestRuntimeLazyExports:
+    def test_lazy_exports_are_cached_in_module_globals(self) -> None:
+        import orchid_commons.runtime as runtime_module
+
+        assert runtime_module.ResourceManager is manager_module.ResourceManager
+        for name in (
+            "ResourceFactory",
+            "ResourceManager",
+            "bootstrap_resources",
+            "register_factory",
+        ):
+            assert vars(runtime_module)[name] is getattr(manager_module, name)
+
+    def test_unknown_attribute_raises(self) -> None:
+        import orchid_commons.runtime as runtime_module
+
+        with pytest.raises(AttributeError):
+            _ = runtime_module.does_not_exist
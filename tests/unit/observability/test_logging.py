@@ -13,6 +13,7 @@ from orchid_commons.observability.logging import (
     correlation_scope,
     correlation_scope_from_headers,
     get_correlation_ids,
+    get_request_id,
     get_structlog_compat_logger,
     parse_traceparent,
 )
@@ -65,6 +66,23 @@ def test_correlation_scope_from_headers_uses_traceparent() -> None:
     assert get_correlation_ids().span_id is None
 
 
+def test_get_request_id_is_exported_from_package_root() -> None:
+    import orchid_commons
+
+    assert orchid_commons.get_request_id is get_request_id
+    assert "get_request_id" in orchid_commons.__all__
+
+
+def test_get_request_id_tracks_nested_scopes() -> None:
+    assert get_request_id() is None
+    with correlation_scope(request_id="outer"):
+        assert get_request_id() == "outer"
+        with correlation_scope(request_id="inner"):
+            assert get_request_id() == "inner"
+        assert get_request_id() == "outer"
+    assert get_request_id() is None
+
+
 def test_sampling_zero_drops_info_but_keeps_warning() -> None:
     stream = StringIO()
     logger = logging.getLogger("tests.logging.sampling")